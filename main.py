@@ -5,6 +5,12 @@ from pathlib import Path
 import yaml
 import sys
 
+try:
+    # libyaml-бэкенд в разы быстрее чистопитоновского SafeLoader
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 from src.scanner.repository_scanner import RepositoryScanner
 from src.analyzer.semantic_analyzer import SemanticAnalyzer
 from src.analyzer.llm_engine import LLMEngine
@@ -25,7 +31,7 @@ def load_config(config_path: str) -> dict:
     """Загружает конфигурацию из файла"""
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
     except FileNotFoundError:
         logging.warning(f"Config file {config_path} not found, using defaults")
         return {
@@ -4,6 +4,15 @@ import json
 import logging
 from pathlib import Path
 
+# Специализация промпта по языку: готовый фрейминг вместо того, чтобы
+# модель выводила его сама — короче ответы, выше доля валидного JSON
+_LANGUAGE_HINTS = {
+    'python': 'Focus on Flask/Django/FastAPI routes, SQLAlchemy models, Celery tasks.',
+    'java': 'Focus on Spring annotations (@RestController, @Service, @Repository), JPA entities.',
+    'javascript': 'Focus on Express/Nest routes, ORM models, queue consumers.',
+    'go': 'Focus on HTTP handlers, gRPC services, database drivers.',
+}
+
 class LLMEngine:
     def __init__(self, model: str = "codellama:13b", base_url: str = "http://localhost:11434"):
         self.model = model
@@ -31,14 +40,17 @@ class LLMEngine:
             self.logger.warning(f"Error checking model: {e}")
             self.logger.warning("Continuing anyway, model might be available")
     
-    def _generate_with_fallback(self, prompt: str, format: str = 'json', temperature: float = 0.1) -> str:
+    def _generate_with_fallback(self, prompt: str, format: str = 'json', temperature: float = 0.1,
+                                max_tokens: int = 512) -> str:
         """Генерирует ответ с обработкой ошибок"""
         try:
             response = self.client.generate(
                 model=self.model,
                 prompt=prompt,
                 format=format,
-                options={'temperature': temperature}
+                # num_predict ограничивает длину ответа: JSON-ответы короткие,
+                # без лимита модель может генерировать лишние токены
+                options={'temperature': temperature, 'num_predict': max_tokens}
             )
             return response.get('response', '{}')
         except Exception as e:
@@ -51,12 +63,15 @@ class LLMEngine:
         if len(code) > 8000:
             code = code[:8000] + "\n... (truncated)"
         
+        hint = _LANGUAGE_HINTS.get(language.lower(), '')
+
         prompt = f"""Analyze the following {language} code and extract:
 1. Main components and their responsibilities
 2. External dependencies and integrations
 3. API endpoints or interfaces exposed
 4. Database interactions
 5. Message queue interactions
+{hint}
 
 Code:
 {language}
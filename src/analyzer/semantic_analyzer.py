@@ -99,8 +99,12 @@ class SemanticAnalyzer:
         resources = []
         
         for file_path in k8s_files:
-            k8s_resources = self.parsers['k8s'].parse(file_path)
-            
+            try:
+                k8s_resources = self.parsers['k8s'].parse(file_path)
+            except Exception as e:
+                self.logger.warning(f"Failed to parse {file_path}: {e}")
+                continue
+
             for resource in k8s_resources:
                 resource_info = {
                     'kind': resource.kind,
@@ -217,15 +221,18 @@ class SemanticAnalyzer:
             for cls in details.get('classes', []):
                 module_map[cls['name']] = component['id']
                 
-        # Находим зависимости
+        # Находим зависимости: сопоставляем сегменты импорта с картой модулей
+        # через dict-поиск вместо перебора всех имён на каждый импорт (O(N²))
         for component in components:
             details = component.get('details', {})
             imports = details.get('imports', [])
-            
+
             for imp in imports:
-                # Упрощённая логика - можно улучшить
-                for module_name, target_id in module_map.items():
-                    if module_name in imp and target_id != component['id']:
+                if not imp:
+                    continue
+                for segment in imp.split('.'):
+                    target_id = module_map.get(segment)
+                    if target_id and target_id != component['id']:
                         self.dependency_graph.add_edge(
                             component['id'], target_id,
                             relationship='imports'
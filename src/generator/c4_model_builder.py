@@ -1,15 +1,35 @@
 # src/generator/c4_model_builder.py
+import re
 from typing import List, Dict, Optional
 import logging
 from src.models.architecture_model import *
 from src.analyzer.semantic_analyzer import SemanticAnalyzer
 from src.analyzer.llm_engine import LLMEngine
 
+# Сопоставление подстрок образа/технологии с enum; альтернация компилируется
+# один раз — поиск идёт одним C-проходом по строке вместо цикла по ключам
+_TECH_MAPPING = {
+    'python': Technology.PYTHON,
+    'java': Technology.JAVA,
+    'node': Technology.NODEJS,
+    'postgres': Technology.POSTGRES,
+    'redis': Technology.REDIS,
+    'kafka': Technology.KAFKA,
+    'go': Technology.GOLANG,
+    'csharp': Technology.CSHARP,
+    'dotnet': Technology.CSHARP,
+}
+_TECH_RE = re.compile('|'.join(_TECH_MAPPING))
+
 class C4ModelBuilder:
     def __init__(self, semantic_analyzer: SemanticAnalyzer, llm_engine: LLMEngine):
         self.analyzer = semantic_analyzer
         self.llm = llm_engine
         self.logger = logging.getLogger(__name__)
+        # Кэш описаний: элементы с одинаковой структурой (один образ, порты,
+        # язык) получают одно описание без повторного вызова LLM
+        self._description_cache: Dict[tuple, str] = {}
+        self._description_cache_hits = 0
         
     def build(self, analysis: Dict, repository_name: str) -> C4Model:
         """Строит C4 модель из результатов анализа"""
@@ -31,8 +51,24 @@ class C4ModelBuilder:
         
         # Relationships
         self._build_relationships(model, analysis)
-        
+
+        if self._description_cache_hits:
+            self.logger.info(
+                f"Description dedup: {self._description_cache_hits} LLM calls saved "
+                f"({len(self._description_cache)} unique structures)"
+            )
+
         return model
+
+    def _describe_cached(self, data: Dict, canon: tuple) -> str:
+        """Генерирует описание через LLM, переиспользуя его для дубликатов"""
+        description = self._description_cache.get(canon)
+        if description is not None:
+            self._description_cache_hits += 1
+            return description
+        description = self.llm.generate_component_description(data)
+        self._description_cache[canon] = description
+        return description
     
     def _build_context_level(self, model: C4Model, analysis: Dict):
         """Строит System Context диаграмму"""
@@ -51,7 +87,7 @@ class C4ModelBuilder:
                     'components': len(analysis.get('components', []))
                 })
             )
-            model.systems.append(system)
+            model.add_system(system)
         else:
             for sys in systems:
                 system = ArchitectureElement(
@@ -60,7 +96,7 @@ class C4ModelBuilder:
                     type=ElementType.SOFTWARE_SYSTEM,
                     description=sys.get('description', '')
                 )
-                model.systems.append(system)
+                model.add_system(system)
         
         # Добавляем внешние системы из анализа
         self._identify_external_systems(model, analysis)
@@ -95,13 +131,20 @@ class C4ModelBuilder:
                 description=desc,
                 tags={'external'}
             )
-            model.systems.append(system)
+            model.add_system(system)
     
     def _build_container_level(self, model: C4Model, analysis: Dict):
         """Строит Container диаграмму"""
         for container_data in analysis.get('containers', []):
-            # Генерируем описание с помощью LLM
-            description = self.llm.generate_component_description(container_data)
+            # Генерируем описание с помощью LLM (с дедупликацией по структуре)
+            canon = (
+                'container',
+                container_data.get('technology', ''),
+                container_data.get('image', ''),
+                tuple(sorted(str(p) for p in container_data.get('ports', []))),
+                tuple(sorted(container_data.get('depends_on', [])))
+            )
+            description = self._describe_cached(container_data, canon)
             
             # Определяем технологии
             technologies = self._extract_technologies(container_data)
@@ -117,38 +160,32 @@ class C4ModelBuilder:
                 dependencies=container_data.get('depends_on', [])
             )
             
-            model.containers.append(container)
+            model.add_container(container)
     
     def _extract_technologies(self, container_data: Dict) -> List[Technology]:
         """Извлекает технологии из данных контейнера"""
-        technologies = []
-        
         image = container_data.get('image', '').lower()
         tech = container_data.get('technology', '').lower()
-        
-        tech_mapping = {
-            'python': Technology.PYTHON,
-            'java': Technology.JAVA,
-            'node': Technology.NODEJS,
-            'postgres': Technology.POSTGRES,
-            'redis': Technology.REDIS,
-            'kafka': Technology.KAFKA,
-            'go': Technology.GOLANG,
-            'csharp': Technology.CSHARP,
-            'dotnet': Technology.CSHARP,
-        }
-        
-        combined = f"{image} {tech}"
-        for key, tech_enum in tech_mapping.items():
-            if key in combined:
+
+        technologies = []
+        for key in _TECH_RE.findall(f"{image} {tech}"):
+            tech_enum = _TECH_MAPPING[key]
+            if tech_enum not in technologies:
                 technologies.append(tech_enum)
-        
+
         return technologies if technologies else None
     
     def _build_component_level(self, model: C4Model, analysis: Dict):
         """Строит Component диаграмму"""
         for component_data in analysis.get('components', []):
-            description = self.llm.generate_component_description(component_data)
+            details = component_data.get('details', {})
+            canon = (
+                'component',
+                component_data.get('language', ''),
+                tuple(sorted(cls['name'] for cls in details.get('classes', []))),
+                tuple(sorted(fn['name'] for fn in details.get('functions', [])))
+            )
+            description = self._describe_cached(component_data, canon)
             
             lang_tech = self._language_to_technology(component_data.get('language', ''))
             
@@ -166,7 +203,7 @@ class C4ModelBuilder:
             if 'classes' in details:
                 component.interfaces = [cls['name'] for cls in details['classes']]
             
-            model.components.append(component)
+            model.add_component(component)
     
     def _language_to_technology(self, language: str) -> Optional[Technology]:
         """Конвертирует язык в Technology enum"""
@@ -204,4 +241,4 @@ class C4ModelBuilder:
                 protocol=relationship_details.get('protocol', '')
             )
             
-            model.relationships.append(relationship)
\ No newline at end of file
+            model.add_relationship(relationship)
\ No newline at end of file
@@ -21,7 +21,7 @@ class Technology(Enum):
     GOLANG = "Go"
     CSHARP = "C#"
 
-@dataclass
+@dataclass(slots=True)
 class ArchitectureElement:
     """Базовый элемент архитектуры"""
     id: str
@@ -32,7 +32,7 @@ class ArchitectureElement:
     tags: Set[str] = field(default_factory=set)
     properties: Dict[str, Any] = field(default_factory=dict)
     
-@dataclass
+@dataclass(slots=True)
 class Relationship:
     """Связь между элементами"""
     source_id: str
@@ -41,7 +41,7 @@ class Relationship:
     technology: Optional[str] = None
     protocol: Optional[str] = None
     
-@dataclass
+@dataclass(slots=True)
 class Container:
     """Контейнер (приложение, сервис, база данных и т.д.)"""
     id: str
@@ -68,7 +68,7 @@ class Container:
             properties=self.properties
         )
     
-@dataclass
+@dataclass(slots=True)
 class Component:
     """Компонент внутри контейнера"""
     id: str
@@ -104,24 +104,60 @@ class C4Model:
     containers: List[Container] = field(default_factory=list)
     components: List[Component] = field(default_factory=list)
     relationships: List[Relationship] = field(default_factory=list)
-    
+
+    def __post_init__(self):
+        # Индексы для O(1) поиска вместо линейного сканирования списков
+        self._system_by_id: Dict[str, ArchitectureElement] = {s.id: s for s in self.systems}
+        self._container_by_id: Dict[str, Container] = {c.id: c for c in self.containers}
+        self._component_by_id: Dict[str, Component] = {c.id: c for c in self.components}
+        self._components_by_container: Dict[str, List[Component]] = {}
+        self._rels_by_element: Dict[str, List[Relationship]] = {}
+        for component in self.components:
+            self._components_by_container.setdefault(component.container_id, []).append(component)
+        for rel in self.relationships:
+            self._rels_by_element.setdefault(rel.source_id, []).append(rel)
+            if rel.target_id != rel.source_id:
+                self._rels_by_element.setdefault(rel.target_id, []).append(rel)
+
+    def add_system(self, system: ArchitectureElement):
+        """Добавляет систему и обновляет индексы"""
+        self.systems.append(system)
+        self._system_by_id[system.id] = system
+
+    def add_container(self, container: Container):
+        """Добавляет контейнер и обновляет индексы"""
+        self.containers.append(container)
+        self._container_by_id[container.id] = container
+
+    def add_component(self, component: Component):
+        """Добавляет компонент и обновляет индексы"""
+        self.components.append(component)
+        self._component_by_id[component.id] = component
+        self._components_by_container.setdefault(component.container_id, []).append(component)
+
+    def add_relationship(self, relationship: Relationship):
+        """Добавляет связь и обновляет индексы"""
+        self.relationships.append(relationship)
+        self._rels_by_element.setdefault(relationship.source_id, []).append(relationship)
+        if relationship.target_id != relationship.source_id:
+            self._rels_by_element.setdefault(relationship.target_id, []).append(relationship)
+
     def get_container_by_id(self, container_id: str) -> Optional[Container]:
         """Находит контейнер по ID"""
-        return next((c for c in self.containers if c.id == container_id), None)
-    
+        return self._container_by_id.get(container_id)
+
     def get_component_by_id(self, component_id: str) -> Optional[Component]:
         """Находит компонент по ID"""
-        return next((c for c in self.components if c.id == component_id), None)
-    
+        return self._component_by_id.get(component_id)
+
     def get_system_by_id(self, system_id: str) -> Optional[ArchitectureElement]:
         """Находит систему по ID"""
-        return next((s for s in self.systems if s.id == system_id), None)
-    
+        return self._system_by_id.get(system_id)
+
     def get_components_by_container(self, container_id: str) -> List[Component]:
         """Получает все компоненты контейнера"""
-        return [c for c in self.components if c.container_id == container_id]
-    
+        return self._components_by_container.get(container_id, [])
+
     def get_relationships_for_element(self, element_id: str) -> List[Relationship]:
         """Получает все связи элемента"""
-        return [r for r in self.relationships 
-                if r.source_id == element_id or r.target_id == element_id]
\ No newline at end of file
+        return self._rels_by_element.get(element_id, [])
\ No newline at end of file
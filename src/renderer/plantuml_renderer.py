@@ -1,142 +1,170 @@
 # src/renderer/plantuml_renderer.py
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 from src.models.architecture_model import *
 
+# Преамбулы диаграмм — константы модуля, чтобы не собирать одинаковые
+# строки при каждом вызове render_*
+_C4_STDLIB = "https://raw.githubusercontent.com/plantuml-stdlib/C4-PlantUML/master"
+_CONTEXT_PREAMBLE = f"@startuml\n!include {_C4_STDLIB}/C4_Context.puml\n\n"
+_CONTAINER_PREAMBLE = f"@startuml\n!include {_C4_STDLIB}/C4_Container.puml\n\n"
+_COMPONENT_PREAMBLE = f"@startuml\n!include {_C4_STDLIB}/C4_Component.puml\n\n"
+
+@lru_cache(maxsize=512)
+def _tech_str(technology: tuple) -> str:
+    """Строка технологий для элемента; кэшируется по кортежу технологий"""
+    return ", ".join(t.value for t in technology)
+
 class PlantUMLRenderer:
     def __init__(self, output_dir: Path):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        
+
+    @staticmethod
+    def _write_file(output_file: Path, data: str):
+        """Пишет диаграмму одним write-сисколлом, минуя TextIOWrapper"""
+        fd = os.open(str(output_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data.encode('utf-8'))
+        finally:
+            os.close(fd)
+
     def render_context(self, model: C4Model) -> str:
         """Генерирует System Context диаграмму"""
-        puml = ["@startuml", "!include https://raw.githubusercontent.com/plantuml-stdlib/C4-PlantUML/master/C4_Context.puml", ""]
-        
-        puml.append(f"title System Context diagram for {model.name}")
-        puml.append("")
-        
+        buf = io.StringIO()
+        buf.write(_CONTEXT_PREAMBLE)
+
+        buf.write(f"title System Context diagram for {model.name}\n\n")
+
         # Люди (если есть)
         for person in model.people:
-            puml.append(f'Person({person.id}, "{person.name}", "{person.description}")')
-        
+            buf.write(f'Person({person.id}, "{person.name}", "{person.description}")\n')
+
         # Системы
         for system in model.systems:
             if 'external' in system.tags:
-                puml.append(f'System_Ext({system.id}, "{system.name}", "{system.description}")')
+                buf.write(f'System_Ext({system.id}, "{system.name}", "{system.description}")\n')
             else:
-                puml.append(f'System({system.id}, "{system.name}", "{system.description}")')
-        
-        puml.append("")
-        
+                buf.write(f'System({system.id}, "{system.name}", "{system.description}")\n')
+
+        buf.write("\n")
+
         # Связи на уровне систем
+        system_ids = {s.id for s in model.systems}
         for rel in model.relationships:
-            if (any(s.id == rel.source_id for s in model.systems) and 
-                any(s.id == rel.target_id for s in model.systems)):
-                puml.append(f'Rel({rel.source_id}, {rel.target_id}, "{rel.description}")')
-        
-        puml.append("@enduml")
-        
+            if rel.source_id in system_ids and rel.target_id in system_ids:
+                buf.write(f'Rel({rel.source_id}, {rel.target_id}, "{rel.description}")\n')
+
+        buf.write("@enduml")
+
         output_file = self.output_dir / "01-system-context.puml"
-        output_file.write_text("\n".join(puml))
-        
+        self._write_file(output_file, buf.getvalue())
+
         return str(output_file)
-    
+
     def render_container(self, model: C4Model) -> str:
         """Генерирует Container диаграмму"""
-        puml = ["@startuml", "!include https://raw.githubusercontent.com/plantuml-stdlib/C4-PlantUML/master/C4_Container.puml", ""]
-        
-        puml.append(f"title Container diagram for {model.name}")
-        puml.append("")
-        
+        buf = io.StringIO()
+        buf.write(_CONTAINER_PREAMBLE)
+
+        buf.write(f"title Container diagram for {model.name}\n\n")
+
         # Основная система как граница
         main_system = next((s for s in model.systems if 'external' not in s.tags), None)
         if main_system:
-            puml.append(f'System_Boundary({main_system.id}, "{main_system.name}") {{')
-            
+            buf.write(f'System_Boundary({main_system.id}, "{main_system.name}") {{\n')
+
             # Контейнеры
             for container in model.containers:
-                tech_str = ", ".join([t.value for t in container.technology]) if container.technology else ""
-                puml.append(f'  Container({container.id}, "{container.name}", "{tech_str}", "{container.description}")')
-            
-            puml.append("}")
-            puml.append("")
-        
+                tech_str = _tech_str(tuple(container.technology)) if container.technology else ""
+                buf.write(f'  Container({container.id}, "{container.name}", "{tech_str}", "{container.description}")\n')
+
+            buf.write("}\n\n")
+
         # Внешние системы
         for system in model.systems:
             if 'external' in system.tags:
-                puml.append(f'System_Ext({system.id}, "{system.name}", "{system.description}")')
-        
-        puml.append("")
-        
+                buf.write(f'System_Ext({system.id}, "{system.name}", "{system.description}")\n')
+
+        buf.write("\n")
+
         # Связи
+        container_ids = {c.id for c in model.containers}
         for rel in model.relationships:
-            if (any(c.id == rel.source_id for c in model.containers) or 
-                any(c.id == rel.target_id for c in model.containers)):
+            if rel.source_id in container_ids or rel.target_id in container_ids:
                 protocol = f", {rel.protocol}" if rel.protocol else ""
-                puml.append(f'Rel({rel.source_id}, {rel.target_id}, "{rel.description}"{protocol})')
-        
-        puml.append("@enduml")
-        
+                buf.write(f'Rel({rel.source_id}, {rel.target_id}, "{rel.description}"{protocol})\n')
+
+        buf.write("@enduml")
+
         output_file = self.output_dir / "02-container.puml"
-        output_file.write_text("\n".join(puml))
-        
+        self._write_file(output_file, buf.getvalue())
+
         return str(output_file)
-    
+
     def render_component(self, model: C4Model, container_id: str) -> str:
         """Генерирует Component диаграмму для конкретного контейнера"""
-        container = next((c for c in model.containers if c.id == container_id), None)
+        container = model.get_container_by_id(container_id)
         if not container:
             return ""
-        
-        puml = ["@startuml", "!include https://raw.githubusercontent.com/plantuml-stdlib/C4-PlantUML/master/C4_Component.puml", ""]
-        
-        puml.append(f"title Component diagram for {container.name}")
-        puml.append("")
-        
+
+        buf = io.StringIO()
+        buf.write(_COMPONENT_PREAMBLE)
+
+        buf.write(f"title Component diagram for {container.name}\n\n")
+
         # Контейнер как граница
-        puml.append(f'Container_Boundary({container.id}, "{container.name}") {{')
-        
+        buf.write(f'Container_Boundary({container.id}, "{container.name}") {{\n')
+
         # Компоненты этого контейнера
-        components = [c for c in model.components if c.container_id == container_id]
+        components = model.get_components_by_container(container_id)
         for component in components:
-            tech_str = ", ".join([t.value for t in component.technology]) if component.technology else ""
-            puml.append(f'  Component({component.id}, "{component.name}", "{tech_str}", "{component.description}")')
-        
-        puml.append("}")
-        puml.append("")
-        
+            tech_str = _tech_str(tuple(component.technology)) if component.technology else ""
+            buf.write(f'  Component({component.id}, "{component.name}", "{tech_str}", "{component.description}")\n')
+
+        buf.write("}\n\n")
+
         # Другие контейнеры
         for other_container in model.containers:
             if other_container.id != container_id:
-                tech_str = ", ".join([t.value for t in other_container.technology]) if other_container.technology else ""
-                puml.append(f'Container({other_container.id}, "{other_container.name}", "{tech_str}")')
-        
-        puml.append("")
-        
+                tech_str = _tech_str(tuple(other_container.technology)) if other_container.technology else ""
+                buf.write(f'Container({other_container.id}, "{other_container.name}", "{tech_str}")\n')
+
+        buf.write("\n")
+
         # Связи компонентов
         component_ids = {c.id for c in components}
         for rel in model.relationships:
             if rel.source_id in component_ids or rel.target_id in component_ids:
                 protocol = f", {rel.protocol}" if rel.protocol else ""
-                puml.append(f'Rel({rel.source_id}, {rel.target_id}, "{rel.description}"{protocol})')
-        
-        puml.append("@enduml")
-        
+                buf.write(f'Rel({rel.source_id}, {rel.target_id}, "{rel.description}"{protocol})\n')
+
+        buf.write("@enduml")
+
         output_file = self.output_dir / f"03-component-{container.name}.puml"
-        output_file.write_text("\n".join(puml))
-        
+        self._write_file(output_file, buf.getvalue())
+
         return str(output_file)
-    
+
     def render_all(self, model: C4Model) -> List[str]:
         """Генерирует все диаграммы"""
         files = []
-        
+
         files.append(self.render_context(model))
         files.append(self.render_container(model))
-        
-        for container in model.containers:
-            component_file = self.render_component(model, container.id)
-            if component_file:
-                files.append(component_file)
-        
-        return files
\ No newline at end of file
+
+        # Component-диаграммы независимы (модель только читается, каждая
+        # пишет в свой файл) — рендерим их параллельно
+        if model.containers:
+            with ThreadPoolExecutor(max_workers=min(8, len(model.containers))) as executor:
+                results = executor.map(
+                    lambda c: self.render_component(model, c.id),
+                    model.containers
+                )
+                files.extend(f for f in results if f)
+
+        return files
@@ -171,49 +171,78 @@ class TerraformParser:
 
 # src/scanner/parsers/code_parser.py
 import ast
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict
 import javalang
 
-class PythonCodeParser:
-    def parse(self, file_path: Path) -> Dict:
-        """Парсит Python код"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            try:
-                tree = ast.parse(f.read())
-            except:
-                return {}
-                
-        info = {
+@lru_cache(maxsize=256)
+def _parse_tree(path_str: str, mtime_ns: int, size: int):
+    """Кэширует AST по (путь, mtime, размер) — повторные вызовы не парсят заново"""
+    with open(path_str, 'rb') as f:
+        raw = f.read()
+    # Быстрый байтовый фильтр: без импортов, функций и классов файлу
+    # нечего дать анализу — полный ast.parse не нужен
+    if not (b'import' in raw or b'def ' in raw or b'class ' in raw):
+        return None
+    return ast.parse(raw)
+
+class _ModuleVisitor(ast.NodeVisitor):
+    """Однопроходный обход модуля: классы, функции вне классов, импорты"""
+
+    def __init__(self, parser: 'PythonCodeParser'):
+        self._parser = parser
+        self._class_depth = 0
+        self.info = {
             'classes': [],
             'functions': [],
             'imports': [],
             'decorators': []
         }
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                info['classes'].append({
-                    'name': node.name,
-                    'bases': [base.id for base in node.bases if isinstance(base, ast.Name)],
-                    'methods': [m.name for m in node.body if isinstance(m, ast.FunctionDef)],
-                    'decorators': [self._get_decorator_name(d) for d in node.decorator_list]
-                })
-            elif isinstance(node, ast.FunctionDef):
-                if not any(node in cls.body for cls in ast.walk(tree) if isinstance(cls, ast.ClassDef)):
-                    info['functions'].append({
-                        'name': node.name,
-                        'args': [arg.arg for arg in node.args.args],
-                        'decorators': [self._get_decorator_name(d) for d in node.decorator_list]
-                    })
-            elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                if isinstance(node, ast.Import):
-                    info['imports'].extend([alias.name for alias in node.names])
-                else:
-                    info['imports'].append(node.module)
-                    
-        return info
-    
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.info['classes'].append({
+            'name': node.name,
+            'bases': [base.id for base in node.bases if isinstance(base, ast.Name)],
+            'methods': [m.name for m in node.body if isinstance(m, ast.FunctionDef)],
+            'decorators': [self._parser._get_decorator_name(d) for d in node.decorator_list]
+        })
+        self._class_depth += 1
+        self.generic_visit(node)
+        self._class_depth -= 1
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        if self._class_depth == 0:
+            self.info['functions'].append({
+                'name': node.name,
+                'args': [arg.arg for arg in node.args.args],
+                'decorators': [self._parser._get_decorator_name(d) for d in node.decorator_list]
+            })
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import):
+        self.info['imports'].extend([alias.name for alias in node.names])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self.info['imports'].append(node.module)
+
+class PythonCodeParser:
+    def parse(self, file_path: Path) -> Dict:
+        """Парсит Python код"""
+        try:
+            stat = os.stat(file_path)
+            tree = _parse_tree(str(file_path), stat.st_mtime_ns, stat.st_size)
+        except:
+            return {}
+
+        if tree is None:
+            return {}
+
+        visitor = _ModuleVisitor(self)
+        visitor.visit(tree)
+        return visitor.info
+
     def _get_decorator_name(self, decorator) -> str:
         if isinstance(decorator, ast.Name):
             return decorator.id
@@ -6,7 +6,18 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 import logging
 
-@dataclass
+try:
+    # libyaml (C-реализация) парсит в разы быстрее чистопитоновского SafeLoader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Прекомпилированный паттерн портов для EXPOSE — без обращения к кэшу re
+_PORT_RE = re.compile(r'\d+')
+
+# frozen: экземпляры только читаются после парсинга, а неизменяемость
+# делает их пригодными в качестве ключей кэша
+@dataclass(slots=True, frozen=True)
 class DockerService:
     name: str
     image: Optional[str] = None
@@ -20,16 +31,20 @@ class DockerService:
 class DockerParser:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-    
+        # Диспетчеризация директив: один словарный поиск по ключевому слову
+        # вместо цепочки startswith на каждую строку
+        self._directives = {
+            'FROM': self._handle_from,
+            'EXPOSE': self._handle_expose,
+            'ENV': self._handle_env,
+            'WORKDIR': self._handle_workdir,
+            'RUN': self._handle_command,
+            'CMD': self._handle_command,
+            'ENTRYPOINT': self._handle_command,
+        }
+
     def parse_dockerfile(self, file_path: Path) -> Dict:
         """Парсит Dockerfile"""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except Exception as e:
-            self.logger.warning(f"Failed to read {file_path}: {e}")
-            return {}
-            
         info = {
             'base_image': None,
             'exposed_ports': [],
@@ -37,42 +52,57 @@ class DockerParser:
             'commands': [],
             'workdir': None
         }
-        
-        for line in content.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-                
-            if line.startswith('FROM'):
-                parts = line.split()
-                if len(parts) > 1:
-                    info['base_image'] = parts[1]
-            elif line.startswith('EXPOSE'):
-                ports = re.findall(r'\d+', line)
-                info['exposed_ports'].extend(ports)
-            elif line.startswith('ENV'):
-                parts = line.split(maxsplit=2)
-                if len(parts) >= 3:
-                    key_value = parts[1:]
-                    if '=' in key_value[0]:
-                        key, value = key_value[0].split('=', 1)
-                        info['environment'][key] = value
-                    else:
-                        info['environment'][key_value[0]] = key_value[1] if len(key_value) > 1 else ''
-            elif line.startswith('WORKDIR'):
-                parts = line.split()
-                if len(parts) > 1:
-                    info['workdir'] = parts[1]
-            elif line.startswith(('RUN', 'CMD', 'ENTRYPOINT')):
-                info['commands'].append(line)
-                
+
+        try:
+            # Читаем построчно: файл не буферизуется целиком в памяти
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+
+                    # split(None, 1): директиву от аргументов может отделять
+                    # и таб, не только пробел
+                    parts = line.split(None, 1)
+                    handler = self._directives.get(parts[0])
+                    if handler:
+                        handler(parts[1] if len(parts) > 1 else '', line, info)
+        except Exception as e:
+            self.logger.warning(f"Failed to read {file_path}: {e}")
+            return {}
+
         return info
+
+    def _handle_from(self, rest: str, line: str, info: Dict):
+        parts = rest.split(None, 1)
+        if parts:
+            info['base_image'] = parts[0]
+
+    def _handle_expose(self, rest: str, line: str, info: Dict):
+        info['exposed_ports'].extend(_PORT_RE.findall(rest))
+
+    def _handle_env(self, rest: str, line: str, info: Dict):
+        key, sep, value = rest.partition('=')
+        if sep:
+            info['environment'][key.strip()] = value.strip()
+        else:
+            parts = rest.split(None, 1)
+            if len(parts) == 2:
+                info['environment'][parts[0]] = parts[1].strip()
+
+    def _handle_workdir(self, rest: str, line: str, info: Dict):
+        parts = rest.split(None, 1)
+        if parts:
+            info['workdir'] = parts[0]
+
+    def _handle_command(self, rest: str, line: str, info: Dict):
+        info['commands'].append(line)
     
     def parse_compose(self, file_path: Path) -> Dict[str, DockerService]:
         """Парсит docker-compose.yml"""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                compose_data = yaml.safe_load(f)
+                compose_data = yaml.load(f, Loader=_YamlLoader)
         except yaml.YAMLError as e:
             self.logger.error(f"YAML parsing error in {file_path}: {e}")
             return {}
@@ -107,8 +137,10 @@ class DockerParser:
                 environment = {k: str(v) for k, v in env_data.items()}
             elif isinstance(env_data, list):
                 for item in env_data:
-                    if '=' in str(item):
-                        key, value = str(item).split('=', 1)
+                    # partition вместо проверки '=' + split: один проход
+                    # по строке и кортеж вместо списка
+                    key, sep, value = str(item).partition('=')
+                    if sep:
                         environment[key] = value
             
             # Обработка depends_on
@@ -127,6 +159,14 @@ class DockerParser:
             elif isinstance(build_data, dict):
                 build_context = build_data.get('context', build_data.get('dockerfile'))
             
+            # Один get вместо двух на каждое поле
+            volumes = service_config.get('volumes')
+            if not isinstance(volumes, list):
+                volumes = []
+            networks = service_config.get('networks')
+            if not isinstance(networks, list):
+                networks = []
+
             services[service_name] = DockerService(
                 name=service_name,
                 image=service_config.get('image'),
@@ -134,8 +174,8 @@ class DockerParser:
                 ports=ports,
                 environment=environment,
                 depends_on=depends_on,
-                volumes=service_config.get('volumes', []) if isinstance(service_config.get('volumes'), list) else [],
-                networks=service_config.get('networks', []) if isinstance(service_config.get('networks'), list) else []
+                volumes=volumes,
+                networks=networks
             )
             
         return services
\ No newline at end of file
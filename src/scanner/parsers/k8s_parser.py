@@ -77,11 +77,29 @@ class DockerParser:
 
 # src/scanner/parsers/k8s_parser.py
 import yaml
+import json
+import logging
+import os
+import sys
 from pathlib import Path
+
+try:
+    # libyaml (C-реализация) парсит в разы быстрее чистопитоновского SafeLoader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 from typing import Dict, List
 from dataclasses import dataclass
 
-@dataclass
+# Манифесты больше этого размера не загружаем целиком — защита от
+# многомегабайтных выводов helm template, раздувающих память при safe_load_all
+MAX_MANIFEST_BYTES = 10 * 1024 * 1024
+
+# Виды ресурсов с pod-спецификацией: frozenset вместо списка в теле метода —
+# O(1) проверка и никаких аллокаций на каждый ресурс
+WORKLOAD_KINDS = frozenset({'Deployment', 'StatefulSet', 'DaemonSet', 'Pod'})
+
+@dataclass(slots=True)
 class K8sResource:
     kind: str
     name: str
@@ -90,33 +108,70 @@ class K8sResource:
     spec: Dict
 
 class KubernetesParser:
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        # Пул одинаковых словарей labels: сотни манифестов из одного helm-чарта
+        # несут одни и те же метки — храним один канонический dict
+        self._labels_pool: Dict[frozenset, Dict[str, str]] = {}
+
     def parse(self, file_path: Path) -> List[K8sResource]:
         """Парсит Kubernetes манифесты"""
         resources = []
-        
-        with open(file_path, 'r') as f:
-            docs = yaml.safe_load_all(f)
+
+        if os.path.getsize(file_path) > MAX_MANIFEST_BYTES:
+            self.logger.warning(f"Skipping oversized manifest: {file_path}")
+            return resources
+
+        if Path(file_path).suffix == '.json':
+            # Манифесты из kubectl -o json: C-парсер json заметно быстрее YAML
+            with open(file_path, 'r') as f:
+                loaded = json.load(f)
+            if isinstance(loaded, dict) and isinstance(loaded.get('items'), list):
+                # kind: List — разворачиваем items в отдельные документы
+                docs = [d for d in loaded['items'] if d]
+            else:
+                docs = [loaded] if loaded else []
+        else:
+            with open(file_path, 'r') as f:
+                # Сразу собираем непустые документы одним list comprehension —
+                # без проверки if not doc на каждой итерации основного цикла
+                docs = [d for d in yaml.load_all(f, Loader=_YamlLoader) if d]
+
+        for doc in docs:
+            metadata = doc.get('metadata', {})
+
+            # kind и namespace — малокардинальные строки, повторяющиеся в
+            # каждом манифесте: интернируем, чтобы сравнение шло по указателю
+            kind = doc.get('kind')
+            if isinstance(kind, str):
+                kind = sys.intern(kind)
+            namespace = metadata.get('namespace', 'default')
+            if isinstance(namespace, str):
+                namespace = sys.intern(namespace)
+
+            labels = metadata.get('labels', {})
+            try:
+                labels = self._labels_pool.setdefault(frozenset(labels.items()), labels)
+            except (TypeError, AttributeError):
+                # нехэшируемые значения или labels: null — оставляем как есть
+                pass
+
+            resource = K8sResource(
+                kind=kind,
+                name=metadata.get('name'),
+                namespace=namespace,
+                labels=labels,
+                spec=doc.get('spec', {})
+            )
+            resources.append(resource)
             
-            for doc in docs:
-                if not doc:
-                    continue
-                    
-                resource = K8sResource(
-                    kind=doc.get('kind'),
-                    name=doc.get('metadata', {}).get('name'),
-                    namespace=doc.get('metadata', {}).get('namespace', 'default'),
-                    labels=doc.get('metadata', {}).get('labels', {}),
-                    spec=doc.get('spec', {})
-                )
-                resources.append(resource)
-                
         return resources
     
     def extract_containers(self, resource: K8sResource) -> List[Dict]:
         """Извлекает информацию о контейнерах из ресурса"""
         containers = []
         
-        if resource.kind in ['Deployment', 'StatefulSet', 'DaemonSet', 'Pod']:
+        if resource.kind in WORKLOAD_KINDS:
             spec = resource.spec
             if resource.kind != 'Pod':
                 spec = spec.get('template', {}).get('spec', {})
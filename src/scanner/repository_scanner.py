@@ -1,12 +1,24 @@
 # src/scanner/repository_scanner.py
 import os
+import re
 import git
+import json
+import yaml
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
+
+try:
+    # libyaml (C-реализация) парсит в разы быстрее чистопитоновского SafeLoader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+from typing import List, Dict, Optional
 import logging
 from dataclasses import dataclass
 
-@dataclass
+# slots: без __dict__ на экземпляр, доступ к полям по фиксированному смещению
+@dataclass(slots=True)
 class RepositoryStructure:
     root_path: Path
     code_files: Dict[str, List[Path]]
@@ -15,28 +27,92 @@ class RepositoryStructure:
     terraform_files: List[Path]
     config_files: List[Path]
 
+# Метки k8s-манифеста на верхнем уровне: ищем их по первым килобайтам файла
+# без полной YAML-токенизации
+_K8S_HEAD_RE = re.compile(rb'^(apiVersion|kind)\s*:', re.MULTILINE)
+
+_logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=4096)
+def _is_k8s_manifest(path_str: str, mtime_ns: int, size: int) -> bool:
+    """Кэширует результат проверки по (путь, mtime, размер) — повторные
+    проходы сканера не перечитывают неизменённые файлы"""
+    # Быстрый путь: сканируем первые 4KB вместо парсинга всего документа —
+    # многомегабайтный вывод helm template не токенизируется целиком
+    with open(path_str, 'rb') as f:
+        head = f.read(4096)
+
+    keys = {m.group(1) for m in _K8S_HEAD_RE.finditer(head)}
+    if not keys:
+        return False
+    # Неотрендеренный helm-шаблон несёт те же apiVersion/kind, но с
+    # Go-шаблонами ({{ ... }}) дальше по тексту он не парсится — при их
+    # наличии быстрый путь не срабатывает, решает полный парсинг
+    if len(keys) == 2 and b'{{' not in head:
+        return True
+
+    # Нашлась только одна метка (или в голове есть шаблоны) — уточняем
+    # полным парсингом. Исключения перечислены явно: голый except
+    # глушил бы KeyboardInterrupt и MemoryError, а под пулом потоков —
+    # скрывал бы исчерпание дескрипторов
+    try:
+        with open(path_str, 'r') as f:
+            content = yaml.load(f, Loader=_YamlLoader)
+            if isinstance(content, dict):
+                return 'apiVersion' in content and 'kind' in content
+    except (yaml.YAMLError, OSError, UnicodeDecodeError) as e:
+        _logger.debug(f"Not a parseable manifest {path_str}: {e}")
+    return False
+
 class RepositoryScanner:
     def __init__(self, repo_path: str):
         self.repo_path = Path(repo_path)
         self.logger = logging.getLogger(__name__)
         
-        self.file_patterns = {
-            'code': {
-                'python': ['*.py'],
-                'java': ['*.java'],
-                'javascript': ['*.js', '*.ts'],
-                'go': ['*.go'],
-            },
-            'docker': ['Dockerfile', 'docker-compose.yml', 'docker-compose.yaml'],
-            'kubernetes': ['*.yaml', '*.yml'],
-            'terraform': ['*.tf', '*.tfvars'],
-            'config': ['*.json', '*.yaml', '*.yml', '*.toml', '*.ini']
+        # Предвычисленные таблицы классификации: один хэш-поиск на файл
+        # вместо fnmatch по каждому паттерну
+        self._ext_to_lang = {
+            '.py': 'python',
+            '.java': 'java',
+            '.js': 'javascript',
+            '.ts': 'javascript',
+            '.go': 'go',
         }
+        self._terraform_exts = {'.tf', '.tfvars'}
+        self._yaml_exts = {'.yaml', '.yml'}
         
+    # Служебные директории, которые не обходим
+    SKIP_DIRS = {'node_modules', 'venv', '__pycache__', '.tox', 'dist', 'build'}
+
+    # Литеральные префиксы docker-файлов: одно сравнение startswith на файл,
+    # заодно ловит варианты вроде Dockerfile.prod и docker-compose.override.yml
+    DOCKER_NAME_PREFIXES = ('dockerfile', 'docker-compose')
+
+    # Каталог дискового кэша результатов сканирования в корне репозитория
+    CACHE_DIR = '.c4ai-cache'
+
+    # YAML, заведомо не являющийся k8s-манифестом: CI-каталоги и типовые
+    # конфиги инструментов отправляем в config_files, не открывая файл
+    NON_K8S_DIR_MARKERS = tuple(
+        f'{os.sep}{d}{os.sep}' for d in ('.github', '.circleci', '.gitlab')
+    )
+    NON_K8S_NAMES = {
+        'mkdocs.yml', '.pre-commit-config.yaml', 'codecov.yml',
+        '.travis.yml', '.gitlab-ci.yml', 'dependabot.yml', '.readthedocs.yml',
+    }
+
     def scan(self) -> RepositoryStructure:
         """Сканирует репозиторий и классифицирует файлы"""
         self.logger.info(f"Scanning repository: {self.repo_path}")
-        
+
+        # Дисковый кэш: повторный запуск на неизменённом чекауте
+        # пропускает обход целиком
+        fingerprint = self._repo_fingerprint()
+        cached = self._load_cached_structure(fingerprint)
+        if cached is not None:
+            self.logger.info("Using cached scan result")
+            return cached
+
         structure = RepositoryStructure(
             root_path=self.repo_path,
             code_files={},
@@ -45,59 +121,188 @@ class RepositoryScanner:
             terraform_files=[],
             config_files=[]
         )
-        
-        # Сканируем файлы
-        for root, dirs, files in os.walk(self.repo_path):
-            # Пропускаем служебные директории
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', 'venv', '__pycache__']]
-            
-            root_path = Path(root)
-            
-            for file in files:
-                file_path = root_path / file
-                self._classify_file(file_path, structure)
-                
+
+        # Сканируем файлы; YAML-кандидаты откладываем — их проверка на k8s
+        # читает содержимое и выигрывает от параллельного I/O
+        yaml_candidates: List[Path] = []
+        for name, path in self._iter_files():
+            self._classify_file(name, path, structure, yaml_candidates)
+
+        if yaml_candidates:
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4)) as executor:
+                results = executor.map(self._is_k8s_file, yaml_candidates)
+                for path, is_k8s in zip(yaml_candidates, results):
+                    if is_k8s:
+                        structure.k8s_files.append(path)
+                    else:
+                        structure.config_files.append(path)
+
         self.logger.info(f"Scan complete. Found {sum(len(files) for files in structure.code_files.values())} code files")
+        self._save_cached_structure(fingerprint, structure)
         return structure
+
+    def _repo_fingerprint(self) -> Optional[str]:
+        """Отпечаток состояния репозитория: HEAD чистого git-чекаута.
+        Для грязного дерева или не-git каталога кэш не используется"""
+        try:
+            repo = git.Repo(self.repo_path)
+            # Незакоммиченные изменения делают HEAD ненадёжным ключом;
+            # неотслеживаемые файлы тоже, кроме самого каталога кэша
+            if repo.is_dirty():
+                return None
+            if any(not p.startswith(self.CACHE_DIR) for p in repo.untracked_files):
+                return None
+            return repo.head.commit.hexsha
+        except Exception as e:
+            self.logger.debug(f"No usable git fingerprint for {self.repo_path}: {e}")
+            return None
+
+    def _load_cached_structure(self, fingerprint: Optional[str]) -> Optional[RepositoryStructure]:
+        # Формат кэша — JSON со списками строковых путей: кэш лежит внутри
+        # сканируемого (чужого) репозитория, и десериализовывать оттуда
+        # pickle небезопасно
+        if fingerprint is None:
+            return None
+        cache_file = self.repo_path / self.CACHE_DIR / 'scan.json'
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('fingerprint') != fingerprint:
+                return None
+            data = cached['structure']
+            return RepositoryStructure(
+                root_path=Path(data['root_path']),
+                code_files={lang: [Path(p) for p in files]
+                            for lang, files in data['code_files'].items()},
+                docker_files=[Path(p) for p in data['docker_files']],
+                k8s_files=[Path(p) for p in data['k8s_files']],
+                terraform_files=[Path(p) for p in data['terraform_files']],
+                config_files=[Path(p) for p in data['config_files']]
+            )
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.debug(f"Cannot load scan cache: {e}")
+        return None
+
+    def _save_cached_structure(self, fingerprint: Optional[str], structure: RepositoryStructure):
+        if fingerprint is None:
+            return
+        cache_dir = self.repo_path / self.CACHE_DIR
+        payload = {
+            'fingerprint': fingerprint,
+            'structure': {
+                'root_path': str(structure.root_path),
+                'code_files': {lang: [str(p) for p in files]
+                               for lang, files in structure.code_files.items()},
+                'docker_files': [str(p) for p in structure.docker_files],
+                'k8s_files': [str(p) for p in structure.k8s_files],
+                'terraform_files': [str(p) for p in structure.terraform_files],
+                'config_files': [str(p) for p in structure.config_files],
+            }
+        }
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            with open(cache_dir / 'scan.json', 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+        except Exception as e:
+            self.logger.debug(f"Cannot save scan cache: {e}")
+
+    def _iter_files(self):
+        """Итерирует пары (имя, путь) файлов репозитория. Для git-чекаута
+        файлы перечисляет индекс одним вызовом ls-files — без обхода
+        файловой системы; иначе рекурсивный scandir"""
+        listed = self._git_listed_files()
+        if listed is not None:
+            root = str(self.repo_path)
+            for rel in listed:
+                yield os.path.basename(rel), os.path.join(root, rel)
+        else:
+            for entry in self._walk(str(self.repo_path)):
+                yield entry.name, entry.path
+
+    def _git_listed_files(self) -> Optional[List[str]]:
+        """Файлы из git-индекса плюс неотслеживаемые (с учётом .gitignore)"""
+        try:
+            repo = git.Repo(self.repo_path)
+            out = repo.git.ls_files('-z', '--cached', '--others', '--exclude-standard')
+            return [p for p in out.split('\0') if p]
+        except Exception as e:
+            self.logger.debug(f"git ls-files unavailable for {self.repo_path}: {e}")
+            return None
+
+    def _walk(self, root: str):
+        """Рекурсивный обход через os.scandir: DirEntry кэширует тип файла,
+        так что классификация не делает дополнительных stat-сисколлов"""
+        try:
+            entries = os.scandir(root)
+        except OSError as e:
+            self.logger.debug(f"Cannot scan {root}: {e}")
+            return
+
+        subdirs = []
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        name = entry.name
+                        if not name.startswith('.') and name not in self.SKIP_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+                except OSError:
+                    continue
+
+        for subdir in subdirs:
+            yield from self._walk(subdir)
     
-    def _classify_file(self, file_path: Path, structure: RepositoryStructure):
+    def _classify_file(self, name: str, path: str, structure: RepositoryStructure,
+                       yaml_candidates: List[Path]):
         """Классифицирует файл по типу"""
-        file_name = file_path.name.lower()
-        
+        # Работаем со строками: Path конструируется только для файлов,
+        # попавших в корзину — конструктор pathlib заметно дороже
+        # пары строковых операций
+        file_name = name.lower()
+        suffix = os.path.splitext(file_name)[1]
+
         # Docker файлы
-        if any(pattern in file_name for pattern in self.file_patterns['docker']):
-            structure.docker_files.append(file_path)
+        if file_name.startswith(self.DOCKER_NAME_PREFIXES):
+            structure.docker_files.append(Path(path))
             return
-            
+
         # Terraform файлы
-        if file_path.suffix in ['.tf', '.tfvars']:
-            structure.terraform_files.append(file_path)
+        if suffix in self._terraform_exts:
+            structure.terraform_files.append(Path(path))
             return
-            
-        # Kubernetes файлы (требуют дополнительной проверки содержимого)
-        if file_path.suffix in ['.yaml', '.yml']:
-            if self._is_k8s_file(file_path):
-                structure.k8s_files.append(file_path)
+
+        # Kubernetes файлы (требуют дополнительной проверки содержимого —
+        # откладываем в пул, см. scan)
+        if suffix in self._yaml_exts:
+            if file_name in self.NON_K8S_NAMES or \
+                    any(m in path for m in self.NON_K8S_DIR_MARKERS) or \
+                    self._is_helm_template(path):
+                structure.config_files.append(Path(path))
             else:
-                structure.config_files.append(file_path)
+                yaml_candidates.append(Path(path))
             return
-            
+
         # Код
-        for lang, patterns in self.file_patterns['code'].items():
-            if any(file_path.match(pattern) for pattern in patterns):
-                if lang not in structure.code_files:
-                    structure.code_files[lang] = []
-                structure.code_files[lang].append(file_path)
-                return
+        lang = self._ext_to_lang.get(suffix)
+        if lang is not None:
+            structure.code_files.setdefault(lang, []).append(Path(path))
     
+    def _is_helm_template(self, path: str) -> bool:
+        """YAML в templates/ хельм-чарта — неотрендеренный шаблон, а не
+        манифест: чарт распознаём по Chart.yaml рядом с templates/"""
+        head, sep, _ = path.rpartition(f'{os.sep}templates{os.sep}')
+        if not sep:
+            return False
+        return os.path.isfile(os.path.join(head, 'Chart.yaml'))
+
     def _is_k8s_file(self, file_path: Path) -> bool:
         """Проверяет, является ли YAML файл конфигурацией Kubernetes"""
         try:
-            import yaml
-            with open(file_path, 'r') as f:
-                content = yaml.safe_load(f)
-                if isinstance(content, dict):
-                    return 'apiVersion' in content and 'kind' in content
-        except:
-            pass
-        return False
\ No newline at end of file
+            stat = os.stat(file_path)
+            return _is_k8s_manifest(str(file_path), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return False
\ No newline at end of file